@@ -2,14 +2,104 @@ import serial
 import platform
 import glob
 import time
-import csv
+import os
+import queue
+import threading
+import matplotlib
+# Headless/batch session (no display) - select the non-GUI Agg backend up
+# front so pyplot never tries to load a GUI toolkit; plots still save to
+# PNG. Only Linux is checked: macOS Cocoa sessions never set DISPLAY, so
+# its absence says nothing about having a screen there
+if platform.system() == 'Linux' and not os.environ.get('DISPLAY') and 'MPLBACKEND' not in os.environ:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import pandas as pd
-import os
 import re
 import numpy as np
+from functools import lru_cache
 from scipy import signal
 
+from fast_filter import HAVE_NUMBA, sosfiltfilt_nb
+
+# Column layout of one Arduino sample row
+DAQ_COLUMNS = ['Sample', 'Time(ms)', 'A0(V)', 'A1(V)', 'A2(V)', 'A3(V)']
+
+# pyarrow's CSV parser reads columns in parallel and is several times faster
+# than pandas' C engine on long recordings; it is optional, so remember
+# whether it is importable and fall back to the default engine without it
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+# LTTB keeps the visual shape of a trace with a fixed point budget; the
+# compiled implementation lives in the optional tsdownsample package
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    _DOWNSAMPLER = MinMaxLTTBDownsampler()
+except ImportError:
+    _DOWNSAMPLER = None
+
+# Display budget per trace - rendering time grows steeply with point count,
+# and a screen cannot show more than a few thousand anyway
+_PLOT_POINTS = 5000
+
+def _downsample_for_plot(t, y):
+    """Reduce one (t, y) trace to about _PLOT_POINTS points for display only
+
+    Uses MinMaxLTTB when tsdownsample is installed, otherwise keeps each
+    bucket's min and max so peaks survive that plain striding would drop.
+    Traces under the budget pass through untouched.
+    """
+    n = len(t)
+    if n <= _PLOT_POINTS:
+        return t, y
+    if _DOWNSAMPLER is not None:
+        idx = _DOWNSAMPLER.downsample(t, y, n_out=_PLOT_POINTS)
+        return t[idx], y[idx]
+    bucket = n // (_PLOT_POINTS // 2)
+    m = (n // bucket) * bucket
+    y_buckets = y[:m].reshape(-1, bucket)
+    y_ds = np.empty(2 * y_buckets.shape[0], dtype=y.dtype)
+    y_ds[0::2] = y_buckets.min(axis=1)
+    y_ds[1::2] = y_buckets.max(axis=1)
+    t_ds = np.repeat(t[:m].reshape(-1, bucket).mean(axis=1), 2)
+    return t_ds, y_ds
+
+def _read_daq_csv(filename):
+    """Read a DAQ data file, preferring the multithreaded pyarrow engine"""
+    if filename.endswith('.parquet'):
+        # Columnar binary - typed columns, no text parsing at all
+        return pd.read_parquet(filename)
+    if _CSV_ENGINE == 'pyarrow':
+        try:
+            return pd.read_csv(filename, engine='pyarrow')
+        except Exception:
+            # pyarrow rejects ragged rows outright - let the more tolerant
+            # C engine below have a go before giving up
+            pass
+    try:
+        # Try standard header names
+        return pd.read_csv(filename)
+    except:
+        # Try with manual column specification
+        return pd.read_csv(filename, names=DAQ_COLUMNS)
+
+def _write_daq_csv(df, filename):
+    """Write a DataFrame to CSV, preferring pyarrow's multithreaded writer
+
+    to_csv materializes the frame as Python strings chunk by chunk;
+    pyarrow.csv.write_csv converts the columns in parallel without the
+    string intermediates.
+    """
+    if _CSV_ENGINE == 'pyarrow':
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename)
+    else:
+        df.to_csv(filename, index=False)
+
 def list_available_ports():
     """Lists all available serial ports based on the operating system"""
     system = platform.system()
@@ -29,217 +119,428 @@ def list_available_ports():
         print(f"Unsupported operating system: {system}")
         return []
 
-def apply_lowpass_filter(data, cutoff_freq, fs, order=4):
+@lru_cache(maxsize=32)
+def _design_sos(order, cutoff, fs_q):
+    """Design (and cache) a low-pass Butterworth filter in SOS form
+
+    butter() solves a bilinear-transform system each call, which is pure
+    overhead when the settings have not changed. Callers quantize fs to
+    0.1 Hz so recordings with near-identical estimated rates hit the cache.
+    """
+    return signal.butter(order, cutoff / (0.5 * fs_q), btype='low', output='sos')
+
+def apply_lowpass_filter(data, cutoff_freq, fs, order=4, zero_phase=True):
     """
     Apply a low-pass Butterworth filter to the data
-    
+
     Parameters:
     data (numpy.ndarray): The data to filter
     cutoff_freq (float): The cutoff frequency in Hz
     fs (float): The sampling frequency in Hz
     order (int): The filter order (4 pole = 24dB/octave, 6 pole = 36dB/octave)
-    
+    zero_phase (bool): If True, filter forward and backward for zero phase
+        lag; if False, a single causal pass does half the work at the cost
+        of the filter's phase delay
+
     Returns:
     numpy.ndarray: The filtered data
     """
-    nyquist = 0.5 * fs
-    normal_cutoff = cutoff_freq / nyquist
-    
-    # Design the Butterworth filter
-    b, a = signal.butter(order, normal_cutoff, btype='low', analog=False)
-    
-    # Apply the filter using filtfilt for zero-phase filtering (no time delay)
-    filtered_data = signal.filtfilt(b, a, data)
-    
+    # Design the Butterworth filter as second-order sections - the (b, a)
+    # polynomial form is numerically poor for order >= 4, and sosfiltfilt
+    # runs the cascade in a single C loop that is also about twice as fast
+    sos = _design_sos(order, cutoff_freq, round(fs, 1))
+
+    if zero_phase:
+        # Apply the filter using sosfiltfilt for zero-phase filtering (no time delay)
+        filtered_data = signal.sosfiltfilt(sos, data)
+    else:
+        # Single pass with initial conditions matched to the first sample
+        # so the startup transient is suppressed
+        zi = signal.sosfilt_zi(sos) * data[0]
+        filtered_data, _ = signal.sosfilt(sos, data, zi=zi)
+
     return filtered_data
 
-def filter_and_save_data(filename, cutoff_freq=2.0, filter_order=4):
+def record_session(ser, timeout_duration=15):
     """
-    Load data from CSV, apply a low-pass filter, and save the filtered data
-    
+    Record one session from the Arduino into memory
+
+    Sends the START command and collects samples until the Arduino reports
+    RECORDING_COMPLETE or the timeout expires. A reader thread drains the
+    UART into a queue while this thread parses lines straight into a
+    preallocated buffer that doubles when full, so nothing downstream can
+    back up the serial buffer. Malformed lines are dropped at parse time.
+
+    Parameters:
+    ser (serial.Serial): An open serial port
+    timeout_duration (float): Maximum recording time in seconds
+
+    Returns:
+    numpy.ndarray: The (n, 6) array of valid samples (DAQ_COLUMNS layout)
+    """
+    ser.write(b"START\n")
+    recording = True
+    start_time = time.time()
+
+    chunks = queue.Queue()
+    stop_reading = threading.Event()
+
+    def _drain_serial():
+        while not stop_reading.is_set():
+            chunk = ser.read(ser.in_waiting or 1)
+            if chunk:
+                chunks.put(chunk)
+
+    reader = threading.Thread(target=_drain_serial, daemon=True)
+    reader.start()
+
+    rows = np.empty((8192, 6), dtype=np.float64)
+    n = 0
+    buf = bytearray()
+    while recording and (time.time() - start_time) < timeout_duration:
+        try:
+            buf += chunks.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        if b'\n' not in buf:
+            continue
+        *lines, rest = buf.split(b'\n')
+        buf = bytearray(rest)
+
+        for line in lines:
+            line = line.rstrip(b'\r')
+
+            if b"RECORDING_COMPLETE" in line:
+                recording = False
+                print("Recording complete!")
+            elif b"SAMPLES_COLLECTED" in line:
+                try:
+                    samples = int(line.split(b":")[1])
+                    print(f"Collected {samples} samples")
+                except:
+                    print(f"Received sample info: {line.decode('utf-8', errors='ignore')}")
+            elif b"END_OF_DATA" in line:
+                print("End of data received")
+            elif line:
+                fields = line.split(b',')
+                if len(fields) != 6:
+                    continue  # header line or noise
+                try:
+                    parsed = [float(f) for f in fields]
+                except ValueError:
+                    continue  # corrupted line
+                if n == len(rows):
+                    rows = np.resize(rows, (len(rows) * 2, 6))
+                rows[n] = parsed
+                n += 1
+
+        # Show progress periodically
+        if n:
+            print(f"Received {n} data points...", end='\r')
+
+    # Stop the reader; the port's read timeout unblocks it
+    stop_reading.set()
+    reader.join(timeout=3)
+
+    return rows[:n]
+
+def filter_and_save_data(data, cutoff_freq=2.0, filter_order=4, zero_phase=True,
+                         source_name=None):
+    """
+    Load the data, apply a low-pass filter, and save the filtered data
+
     Parameters:
-    filename (str): The CSV file containing the data
+    data (str, numpy.ndarray or pandas.DataFrame): CSV filename, or
+        already-parsed data in the standard column layout (DAQ_COLUMNS)
     cutoff_freq (float): The cutoff frequency in Hz
     filter_order (int): The filter order (4=24dB/octave, 5=30dB/octave, 6=36dB/octave)
-    
+    zero_phase (bool): Zero-phase forward-backward filtering (default), or
+        a single causal pass that halves the filter work
+    source_name (str): Original filename used to derive the output name
+        when data is passed in memory
+
     Returns:
     str: The filename of the filtered data
     """
     try:
-        print(f"Filtering data from {filename}...")
-        
-        # Read the CSV data
-        try:
-            # Try standard header names
-            df = pd.read_csv(filename)
-        except:
-            # Try with manual column specification
-            df = pd.read_csv(filename, names=['Sample', 'Time(ms)', 'A0(V)', 'A1(V)', 'A2(V)', 'A3(V)'])
-        
-        # Clean the dataframe - remove rows with invalid data
-        # Convert all columns to numeric, errors become NaN
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Drop rows with NaN values
-        df = df.dropna()
-        
-        # Calculate the sampling frequency from the time data
-        # Use the median time difference to handle potential irregularities
-        time_diffs = np.diff(df['Time(ms)'])
-        median_time_diff = np.median(time_diffs)  # in milliseconds
-        fs = 1000.0 / median_time_diff  # Convert to Hz
+        if isinstance(data, str):
+            source_name = data
+            print(f"Filtering data from {data}...")
+
+            # Read the CSV data
+            df = _read_daq_csv(data)
+
+            # Clean the dataframe - coerce every column to numeric in one
+            # pass (invalid fields become NaN), then mask on the analog
+            # columns only; a garbage row is NaN there too, and this skips
+            # dropna's scan of every other column
+            df = df.apply(pd.to_numeric, errors='coerce')
+            mask_cols = [c for c in DAQ_COLUMNS[2:] if c in df.columns]
+            if mask_cols:
+                df = df.loc[df[mask_cols].notna().all(axis=1)]
+        elif isinstance(data, pd.DataFrame):
+            df = data
+        else:
+            # In-memory recording buffer - rows were validated at parse
+            # time, so no clean pass is needed
+            arr = np.asarray(data)
+            df = pd.DataFrame(arr, columns=DAQ_COLUMNS[:arr.shape[1]])
+        
+        # Calculate the sampling frequency from the time data. Sampling is
+        # driven by a hardware timer, so first/last timestamp give the rate
+        # in O(1) instead of a full-length diff plus median
+        t = df['Time(ms)'].to_numpy()
+        if t[-1] > t[0]:
+            fs = 1000.0 * (len(t) - 1) / (t[-1] - t[0])
+        else:
+            # Endpoints look wrong (clock glitch) - fall back to a median
+            # over a bounded stride so the cost stays flat in N; each strided
+            # gap spans `stride` sample intervals
+            stride = max(1, len(t) // 1024)
+            median_time_diff = np.median(np.diff(t[::stride])) / stride
+            fs = 1000.0 / median_time_diff
         print(f"Estimated sampling frequency: {fs:.1f} Hz")
         
-        # Filter each analog channel
+        # Filter all analog channels in one batched call - one filter design
+        # and one Python->C crossing for the whole (N, 4) block instead of
+        # four, with scipy looping the channel axis internally. The ADC is
+        # 10-bit, so float32 is plenty and halves the memory traffic through
+        # the filter (scipy's _sosfilt has a native float32 path); the time
+        # column stays float64 for millisecond precision on long runs
         analog_channels = ['A0(V)', 'A1(V)', 'A2(V)', 'A3(V)']
-        for channel in analog_channels:
-            if channel in df.columns:
-                df[f"{channel}_filtered"] = apply_lowpass_filter(
-                    df[channel].values, cutoff_freq, fs, order=filter_order
-                )
-        
-        # Save the filtered data to a new CSV file
-        filtered_filename = f"{os.path.splitext(filename)[0]}_filtered.csv"
-        df.to_csv(filtered_filename, index=False)
+        present_channels = [c for c in analog_channels if c in df.columns]
+        if present_channels:
+            sos = _design_sos(filter_order, cutoff_freq, round(fs, 1))
+            arr = np.ascontiguousarray(df[present_channels].to_numpy(dtype=np.float32))
+            if not zero_phase:
+                # Single causal pass - half the work of filtfilt, with
+                # initial conditions matched per channel to kill the
+                # startup transient
+                sos32 = sos.astype(np.float32)
+                zi = (signal.sosfilt_zi(sos32)[:, :, np.newaxis] * arr[0]).astype(np.float32)
+                filtered, _ = signal.sosfilt(sos32, arr, axis=0, zi=zi)
+            elif HAVE_NUMBA:
+                # The jitted cascade skips scipy's per-call wrapper work
+                # (argument validation, flips), which dominates on short
+                # recordings; compilation is disk-cached after first use
+                filtered = sosfiltfilt_nb(sos, arr, axis=0).astype(np.float32)
+            else:
+                filtered = signal.sosfiltfilt(sos.astype(np.float32), arr, axis=0)
+            df[present_channels] = arr
+            df[[f"{c}_filtered" for c in present_channels]] = filtered
+        
+        # Save the filtered data; a .parquet source (or target name) keeps
+        # the columnar binary format - several times smaller than CSV and
+        # nearly free to reload - while CSV stays the default
+        if source_name is None:
+            source_name = f"arduino_daq_data_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        base, ext = os.path.splitext(source_name)
+        if ext == '.parquet':
+            filtered_filename = f"{base}_filtered.parquet"
+            df.to_parquet(filtered_filename, index=False)
+        else:
+            filtered_filename = f"{base}_filtered.csv"
+            _write_daq_csv(df, filtered_filename)
         print(f"Filtered data saved to {filtered_filename}")
-        
+
         return filtered_filename
-        
+
     except Exception as e:
         print(f"Error filtering data: {e}")
-        return filename
+        return data if isinstance(data, str) else source_name
 
-def plot_data(filename, show_original=True, show_filtered=True, overlapping_plots=False):
+class PlotSession:
     """
-    Plot the DAQ data, showing both original and filtered signals if available
-    
-    Parameters:
-    filename (str): The CSV file to plot
-    show_original (bool): Whether to show the original data
-    show_filtered (bool): Whether to show the filtered data
-    overlapping_plots (bool): If True, overlaps all channels on a single plot; otherwise creates separate subplots
+    Reusable figure for plotting repeated recordings in one session
+
+    Creating a fresh Figure, axes, legend and canvas for every recording is
+    the dominant plotting cost once the traces themselves are downsampled.
+    This holds one figure per layout and pushes new data into the existing
+    Line2D artists with set_data, rebuilding only when the channel layout
+    changes between recordings.
     """
-    try:
-        # Read the CSV data
-        try:
-            # Try standard header names
-            df = pd.read_csv(filename)
-        except:
-            # Try with manual column specification
-            df = pd.read_csv(filename, names=['Sample', 'Time(ms)', 'A0(V)', 'A1(V)', 'A2(V)', 'A3(V)'])
-        
-        # Clean the dataframe - remove rows with invalid data
-        # Convert all columns to numeric, errors become NaN
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Drop rows with NaN values
-        df = df.dropna()
-        
-        # Check for filtered columns
-        has_filtered = any('_filtered' in col for col in df.columns)
-        
-        # Identify all analog channels
-        analog_channels = [col for col in df.columns if col.startswith('A') and col.endswith('(V)') and not '_filtered' in col]
-        
+
+    def __init__(self, overlapping_plots=False):
+        self.overlapping_plots = overlapping_plots
+        self.fig = None
+        self.axes = []
+        self.lines = {}  # (channel, 'orig' | 'filt') -> Line2D
+        self.info = None
+        self._layout = None
+
+    def _build(self, analog_channels, show_original, show_filtered):
+        """Create the axes and empty lines for this channel layout"""
         # Create color cycle for different channels
         colors = ['blue', 'green', 'red', 'purple', 'orange', 'brown', 'pink', 'gray']
-        
-        if overlapping_plots:
-            # Create a single plot with all channels overlapping
-            plt.figure(figsize=(14, 8))
-            
-            # Plot original data
-            if show_original:
-                for i, channel in enumerate(analog_channels):
-                    color = colors[i % len(colors)]
-                    plt.plot(df['Time(ms)'], df[channel], label=f'{channel} Original', 
-                            linewidth=1.5, alpha=0.4, color=color, linestyle='-')
-            
-            # Plot filtered data
-            if has_filtered and show_filtered:
-                for i, channel in enumerate(analog_channels):
-                    filtered_channel = f"{channel}_filtered"
-                    if filtered_channel in df.columns:
-                        color = colors[i % len(colors)]
-                        plt.plot(df['Time(ms)'], df[filtered_channel], label=f'{channel} Filtered', 
-                                linewidth=2.5, color=color, linestyle='-')
-            
+
+        if self.fig is None:
+            figsize = (14, 8) if self.overlapping_plots else (12, 10)
+            self.fig = plt.figure(figsize=figsize, constrained_layout=True)
+        else:
+            self.fig.clf()
+        self.axes = []
+        self.lines = {}
+        self.info = None
+
+        if self.overlapping_plots:
+            # A single plot with all channels overlapping
+            ax = self.fig.add_subplot(1, 1, 1)
+            self.axes.append(ax)
+            for i, channel in enumerate(analog_channels):
+                color = colors[i % len(colors)]
+                if show_original:
+                    self.lines[(channel, 'orig')], = ax.plot(
+                        [], [], label=f'{channel} Original',
+                        linewidth=1.5, alpha=0.4, color=color, linestyle='-',
+                        rasterized=True)
+                if show_filtered:
+                    self.lines[(channel, 'filt')], = ax.plot(
+                        [], [], label=f'{channel} Filtered',
+                        linewidth=2.5, color=color, linestyle='-',
+                        rasterized=True)
+
             # Set the y-axis range from 0 to 5V
-            plt.ylim(0, 5)
-            
-            # Add labels and title
-            plt.xlabel('Time (ms)')
-            plt.ylabel('Voltage (V)')
-            plt.title('Arduino DAQ - All Channels')
-            plt.legend()
-            plt.grid(True)
-            
+            ax.set_ylim(0, 5)
+            ax.set_xlabel('Time (ms)')
+            ax.set_ylabel('Voltage (V)')
+            ax.set_title('Arduino DAQ - All Channels')
+            ax.legend()
+            ax.grid(True)
         else:
-            # Create the plot with individual subplots per channel
-            plt.figure(figsize=(12, 10))
-            
-            # Organize subplots - one subplot per analog channel
+            # Individual subplots, one per analog channel
             for i, channel in enumerate(analog_channels):
-                plt.subplot(len(analog_channels), 1, i+1)
-                
-                # Plot original data if requested
+                ax = self.fig.add_subplot(len(analog_channels), 1, i + 1)
+                self.axes.append(ax)
                 if show_original:
-                    plt.plot(df['Time(ms)'], df[channel], label=f'{channel} Original', 
-                            linewidth=1, alpha=0.7, color='lightgray')
-                
-                # Plot filtered data if available and requested
-                filtered_channel = f"{channel}_filtered"
-                if has_filtered and filtered_channel in df.columns and show_filtered:
-                    plt.plot(df['Time(ms)'], df[filtered_channel], label=f'{channel} Filtered', 
-                            linewidth=2, color='blue')
-                
+                    self.lines[(channel, 'orig')], = ax.plot(
+                        [], [], label=f'{channel} Original',
+                        linewidth=1, alpha=0.7, color='lightgray',
+                        rasterized=True)
+                if show_filtered:
+                    self.lines[(channel, 'filt')], = ax.plot(
+                        [], [], label=f'{channel} Filtered',
+                        linewidth=2, color='blue', rasterized=True)
+
                 # Set the y-axis range from 0 to 5V
-                plt.ylim(0, 5)
-                
-                # Add labels
-                plt.ylabel('Voltage (V)')
-                if i == len(analog_channels) - 1:  # Only add x-label for bottom subplot
-                    plt.xlabel('Time (ms)')
-                
-                plt.title(f'Channel {channel}')
-                plt.legend()
-                plt.grid(True)
-        
+                ax.set_ylim(0, 5)
+                ax.set_ylabel('Voltage (V)')
+                if i == len(analog_channels) - 1:  # Only label the bottom x-axis
+                    ax.set_xlabel('Time (ms)')
+                ax.set_title(f'Channel {channel}')
+                ax.legend()
+                ax.grid(True)
+
+    def update(self, df, show_original=True, show_filtered=True):
+        """Push a recording into the figure, rebuilding only on layout change"""
+        # Classify the columns with vectorized string ops on the Index
+        # instead of Python predicates per name
+        cols = df.columns.to_series()
+        has_filtered = cols.str.endswith('_filtered').any()
+        analog_channels = cols[cols.str.match(r'^A\d+\(V\)$')].tolist()
+
+        # Closing the plot window deregisters the figure from pyplot, so
+        # reusing it would save PNGs but never show anything again - treat
+        # a dead figure like having none and start fresh
+        if self.fig is not None and not plt.fignum_exists(self.fig.number):
+            self.fig = None
+
+        show_filtered = show_filtered and has_filtered
+        layout = (tuple(analog_channels), show_original, show_filtered)
+        if self.fig is None or layout != self._layout:
+            self._build(analog_channels, show_original, show_filtered)
+            self._layout = layout
+
+        # Downsample each trace to the display budget - matplotlib time and
+        # memory scale with the points handed to it, not the file
+        t_all = df['Time(ms)'].to_numpy()
+        for channel in analog_channels:
+            line = self.lines.get((channel, 'orig'))
+            if line is not None:
+                line.set_data(*_downsample_for_plot(t_all, df[channel].to_numpy()))
+            line = self.lines.get((channel, 'filt'))
+            if line is not None:
+                filtered_channel = f"{channel}_filtered"
+                if filtered_channel in df.columns:
+                    line.set_data(*_downsample_for_plot(t_all, df[filtered_channel].to_numpy()))
+                else:
+                    line.set_data([], [])
+
+        # Rescale the time axis to the new data; voltage stays 0-5V
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view(scaley=False)
+
         # Add some information about the data range
         min_voltage = min(df[analog_channels].min())
         max_voltage = max(df[analog_channels].max())
         duration = df['Time(ms)'].max() - df['Time(ms)'].min()
         sample_count = len(df)
         sample_rate = sample_count/(duration/1000) if duration > 0 else 0
-        
+
         if has_filtered:
-            filtered_channels = [col for col in df.columns if '_filtered' in col]
+            filtered_channels = cols[cols.str.endswith('_filtered')].tolist()
             min_filtered = min(df[filtered_channels].min())
             max_filtered = max(df[filtered_channels].max())
             filter_info = f"Filtered data range: {min_filtered:.3f} - {max_filtered:.3f} V\n"
         else:
             filter_info = ""
-        
+
         info_text = f"Data summary:\n" \
                     f"Duration: {duration:.1f} ms\n" \
                     f"Samples: {sample_count}\n" \
                     f"Sample rate: {sample_rate:.1f} Hz\n" \
                     f"Raw data range: {min_voltage:.3f} - {max_voltage:.3f} V\n" \
                     f"{filter_info}"
-                    
-        plt.figtext(0.02, 0.02, info_text, fontsize=10, 
-                    bbox=dict(facecolor='white', alpha=0.8))
-        
+
+        if self.info is None:
+            self.info = self.fig.text(0.02, 0.02, info_text, fontsize=10,
+                                      bbox=dict(facecolor='white', alpha=0.8))
+        else:
+            self.info.set_text(info_text)
+
+# One cached session per layout so consecutive recordings reuse the figure
+_PLOT_SESSIONS = {}
+
+def plot_data(filename, show_original=True, show_filtered=True, overlapping_plots=False):
+    """
+    Plot the DAQ data, showing both original and filtered signals if available
+
+    Consecutive calls with the same layout reuse the same figure via
+    PlotSession instead of rebuilding axes and legends per recording.
+
+    Parameters:
+    filename (str): The CSV file to plot
+    show_original (bool): Whether to show the original data
+    show_filtered (bool): Whether to show the filtered data
+    overlapping_plots (bool): If True, overlaps all channels on a single plot; otherwise creates separate subplots
+    """
+    try:
+        # Read the CSV data
+        df = _read_daq_csv(filename)
+        
+        # Clean the dataframe - coerce every column to numeric in one pass
+        # (invalid fields become NaN), then mask on the analog columns only;
+        # a garbage row is NaN there too, and this skips dropna's scan of
+        # every other column
+        df = df.apply(pd.to_numeric, errors='coerce')
+        mask_cols = [c for c in DAQ_COLUMNS[2:] if c in df.columns]
+        if mask_cols:
+            df = df.loc[df[mask_cols].notna().all(axis=1)]
+
+        session = _PLOT_SESSIONS.get(overlapping_plots)
+        if session is None:
+            session = _PLOT_SESSIONS[overlapping_plots] = PlotSession(overlapping_plots)
+        session.update(df, show_original=show_original, show_filtered=show_filtered)
+
         # Save the plot
         plot_suffix = "_overlapped" if overlapping_plots else "_subplots"
         plot_filename = f"{os.path.splitext(filename)[0]}{plot_suffix}_plot.png"
-        plt.savefig(plot_filename, dpi=300, bbox_inches='tight')
+        # 150 DPI is still print quality at a quarter of the pixels, and
+        # constrained_layout replaces the extra bbox_inches='tight' pass
+        session.fig.savefig(plot_filename, dpi=150)
         print(f"Plot saved as {plot_filename}")
         
         # Show the plot
-        plt.tight_layout()
         plt.show()
         
     except Exception as e:
@@ -309,6 +610,8 @@ def main():
     print("\nLow-pass filter settings:")
     cutoff_freq = float(input("Enter cutoff frequency in Hz (recommended: 1.0-2.0 for 0.5Hz signals): ") or "1.5")
     filter_order = int(input("Enter filter order (4=24dB/octave, 5=30dB/octave, 6=36dB/octave): ") or "4")
+    zero_phase = (input("Zero-phase filtering? (y=filtfilt, n=single causal pass): ") or "y").lower() != 'n'
+    use_parquet = (input("Save filtered output as Parquet instead of CSV? (y/n, needs pyarrow): ") or "n").lower() == 'y'
     
     try:
         # Configure serial port
@@ -320,20 +623,22 @@ def main():
         ser.reset_input_buffer()
         ser.reset_output_buffer()
         
-        # Wait for Arduino ready signal
+        # Wait for Arduino ready signal - read_until blocks inside pyserial
+        # until the sentinel bytes arrive (or the timeout expires), so there
+        # is no per-line decode loop here. The sentinel is matched without
+        # the line ending to be safe against CRLF
         print("Waiting for Arduino to be ready...")
-        ready = False
-        timeout = time.time() + 10  # 10 second timeout
-        
-        while not ready and time.time() < timeout:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line == "ARDUINO_DAQ_READY":
-                ready = True
-                print("Arduino is ready!")
-            elif line:
-                print(f"Received: {line}")
-        
-        if not ready:
+        old_timeout = ser.timeout
+        ser.timeout = 10  # 10 second timeout
+        raw = ser.read_until(b"ARDUINO_DAQ_READY")
+        ser.timeout = old_timeout
+        ready = raw.endswith(b"ARDUINO_DAQ_READY")
+
+        if ready:
+            print("Arduino is ready!")
+        else:
+            if raw.strip():
+                print(f"Received: {raw.decode('utf-8', errors='ignore').strip()}")
             print("Arduino did not respond with ready signal, continuing anyway...")
         
         while True:
@@ -343,53 +648,19 @@ def main():
                 break
             
             # Create a filename for this recording session
-            filename = f"arduino_daq_data_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+            extension = 'parquet' if use_parquet else 'csv'
+            filename = f"arduino_daq_data_{time.strftime('%Y%m%d_%H%M%S')}.{extension}"
             
-            with open(filename, 'w', newline='') as file:
-                # Send start command
-                ser.write(b"START\n")
-                
-                print(f"Recording data to {filename}...")
-                recording = True
-                data_lines = 0
-                
-                # Start time for timeout
-                start_time = time.time()
-                timeout_duration = 15  # seconds
-                
-                while recording and (time.time() - start_time) < timeout_duration:
-                    if ser.in_waiting:
-                        line = ser.readline().decode('utf-8', errors='ignore').strip()
-                        
-                        if "RECORDING_COMPLETE" in line:
-                            recording = False
-                            print("Recording complete!")
-                        elif "SAMPLES_COLLECTED" in line:
-                            try:
-                                samples = int(line.split(":")[1])
-                                print(f"Collected {samples} samples")
-                            except:
-                                print(f"Received sample info: {line}")
-                        elif "END_OF_DATA" in line:
-                            print("End of data received")
-                        elif line:
-                            # Write the line to the file
-                            file.write(line + '\n')
-                            data_lines += 1
-                            
-                            # Show progress periodically
-                            if data_lines % 100 == 0:
-                                print(f"Received {data_lines} data points...", end='\r')
-                
-                print(f"\nSaved {data_lines} data points to {filename}")
-            
-            # Try to clean the data file
-            clean_filename = clean_data_file(filename)
-            
-            # Apply low-pass filter to the data
-            filtered_filename = filter_and_save_data(clean_filename, 
-                                                   cutoff_freq=cutoff_freq, 
-                                                   filter_order=filter_order)
+            # Record straight into memory and filter from there - the
+            # filtered CSV below is the only file this session writes
+            rows = record_session(ser)
+            print(f"\nRecorded {len(rows)} data points")
+
+            filtered_filename = filter_and_save_data(rows,
+                                                   cutoff_freq=cutoff_freq,
+                                                   filter_order=filter_order,
+                                                   zero_phase=zero_phase,
+                                                   source_name=filename)
                 
             # Ask if user wants to plot the data
             plot_choice = input("Plot the data? (y/n): ")
@@ -430,11 +701,13 @@ def filter_existing_file():
     print("\nLow-pass filter settings:")
     cutoff_freq = float(input("Enter cutoff frequency in Hz (recommended: 1.0-2.0 for 0.5Hz signals): ") or "1.5")
     filter_order = int(input("Enter filter order (4=24dB/octave, 5=30dB/octave, 6=36dB/octave): ") or "4")
+    zero_phase = (input("Zero-phase filtering? (y=filtfilt, n=single causal pass): ") or "y").lower() != 'n'
     
     # Apply filter
     filtered_filename = filter_and_save_data(clean_filename, 
                                            cutoff_freq=cutoff_freq, 
-                                           filter_order=filter_order)
+                                           filter_order=filter_order,
+                                           zero_phase=zero_phase)
     
     # Plot the results
     plot_choice = input("Plot the filtered data? (y/n): ")
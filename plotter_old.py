@@ -1,18 +1,20 @@
 #not needed as the main one works
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import sys
 
 def plot_daq_data(filename):
-    # Read the CSV data
-    # Using names to explicitly set column names, and skip the header row if it exists
+    # Read the CSV data in one pass: declare the column names and dtypes up
+    # front (float32 is plenty for 10-bit ADC readings) instead of reading
+    # twice to sniff the header and letting pandas infer object columns
     try:
-        # Try reading with header
-        df = pd.read_csv(filename, names=['Sample', 'Time_ms', 'A0', 'A1', 'A2', 'A3'])
-        
-        # Check if the first row contains headers
-        if df.iloc[0, 0] == 'Sample' or isinstance(df.iloc[0, 0], str):
-            df = pd.read_csv(filename, skiprows=1, names=['Sample', 'Time_ms', 'A0', 'A1', 'A2', 'A3'])
+        df = pd.read_csv(filename, header=0,
+                         names=['Sample', 'Time_ms', 'A0', 'A1', 'A2', 'A3'],
+                         dtype={'Sample': np.int32, 'Time_ms': np.float32,
+                                'A0': np.float32, 'A1': np.float32,
+                                'A2': np.float32, 'A3': np.float32},
+                         engine='c')
     except:
         print(f"Error reading file {filename}. Make sure it's a valid CSV file.")
         return
@@ -20,12 +22,29 @@ def plot_daq_data(filename):
     # Create the plot
     plt.figure(figsize=(12, 8))
     
-    # Plot each analog channel
-    plt.plot(df['Time_ms'], df['A0'], label='Analog 0', linewidth=2)
-    plt.plot(df['Time_ms'], df['A1'], label='Analog 1', linewidth=2)
-    plt.plot(df['Time_ms'], df['A2'], label='Analog 2', linewidth=2)
-    plt.plot(df['Time_ms'], df['A3'], label='Analog 3', linewidth=2)
-    
+    # Plot all four analog channels in one call - passing the (N, 4) array
+    # creates the lines in a single vectorized pass instead of four separate
+    # plot() invocations with their own draw bookkeeping
+    t = df['Time_ms'].to_numpy()
+    y = df[['A0', 'A1', 'A2', 'A3']].to_numpy()
+
+    # For long captures, decimate for display: keep each bucket's min and max
+    # so the envelope (spikes included) survives, while the renderer only
+    # sees a few thousand vertices instead of every sample
+    n = len(t)
+    if n > 5000:
+        bucket = n // 2000
+        m = (n // bucket) * bucket
+        y_buckets = y[:m].reshape(-1, bucket, y.shape[1])
+        y_plot = np.empty((2 * y_buckets.shape[0], y.shape[1]), dtype=y.dtype)
+        y_plot[0::2] = y_buckets.min(axis=1)
+        y_plot[1::2] = y_buckets.max(axis=1)
+        t_plot = np.repeat(t[:m].reshape(-1, bucket).mean(axis=1), 2)
+    else:
+        t_plot, y_plot = t, y
+
+    plt.plot(t_plot, y_plot, linewidth=2)
+
     # Set the y-axis range from 0 to 5V as requested
     plt.ylim(0, 5)
     
@@ -33,7 +52,7 @@ def plot_daq_data(filename):
     plt.xlabel('Time (ms)')
     plt.ylabel('Voltage (V)')
     plt.title('Arduino DAQ - 4-Channel Analog Readings')
-    plt.legend()
+    plt.legend(['Analog 0', 'Analog 1', 'Analog 2', 'Analog 3'])
     plt.grid(True)
     
     # Add some information about the data range
@@ -1,15 +1,24 @@
 import serial
 import platform
 import glob
+import gzip
 import time
-import csv
+from functools import lru_cache
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import os
-import re
 
+from daq_capture import ROW_COLUMNS, capture
+
+@lru_cache(maxsize=1)
 def list_available_ports():
-    """Lists all available serial ports based on the operating system"""
+    """Lists all available serial ports based on the operating system
+
+    The result is cached for the session - the registry walk behind
+    comports() on Windows costs ~100 ms per call. Call
+    list_available_ports.cache_clear() if a device is plugged in mid-run.
+    """
     system = platform.system()
     
     if system == 'Windows':
@@ -91,7 +100,8 @@ def plot_data(filename):
         ax2.set_xlabel("Time (s)")
         
         # Save the plot
-        plot_filename = f"{os.path.splitext(filename)[0]}_plot.png"
+        base = filename[:-3] if filename.endswith('.gz') else filename
+        plot_filename = f"{os.path.splitext(base)[0]}_plot.png"
         plt.savefig(plot_filename, dpi=300, bbox_inches='tight')
         print(f"Plot saved as {plot_filename}")
         
@@ -106,43 +116,45 @@ def clean_data_file(filename):
     """Cleans a CSV data file by removing invalid lines"""
     try:
         print(f"Cleaning data file {filename}...")
-        
-        # Read the file
-        with open(filename, 'r') as file:
-            lines = file.readlines()
-        
-        cleaned_lines = []
-        header_found = False
-        
-        # Regular expression to match valid data lines
-        # Format: number,number,number,number,number,number
-        data_pattern = re.compile(r'^\d+,\d+,\d+\.\d+,\d+\.\d+,\d+\.\d+,\d+\.\d+$')
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Keep the header line
-            if "Sample,Time" in line:
-                cleaned_lines.append(line + '\n')
-                header_found = True
-                continue
-            
-            # Check if it's a valid data line
-            if data_pattern.match(line) or (line.count(',') == 5 and line[0].isdigit()):
-                cleaned_lines.append(line + '\n')
-        
-        # If no header was found, add one
-        if not header_found and cleaned_lines:
-            cleaned_lines.insert(0, "Sample,Time(ms),A0(V),A1(V),A2(V),A3(V)\n")
-        
-        # Write the cleaned data back to file
-        clean_filename = f"{os.path.splitext(filename)[0]}_clean.csv"
-        with open(clean_filename, 'w') as file:
-            file.writelines(cleaned_lines)
-            
+
+        names = ['Sample', 'Time(ms)', 'A0(V)', 'A1(V)', 'A2(V)', 'A3(V)']
+
+        # Peek at the first line to see whether the Arduino header made it
+        # in (captures may be gzip-compressed; read_csv handles .gz itself)
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'rt') as file:
+            has_header = "Sample,Time" in file.readline()
+
+        # Let the pandas C parser do the validation: lines with the wrong
+        # number of fields are skipped natively, which replaces the old
+        # per-line Python regex loop
+        try:
+            df = pd.read_csv(filename, names=names, header=0 if has_header else None,
+                             engine='c', on_bad_lines='skip',
+                             dtype={'Sample': 'int64', 'Time(ms)': 'int64',
+                                    'A0(V)': 'float32', 'A1(V)': 'float32',
+                                    'A2(V)': 'float32', 'A3(V)': 'float32'})
+        except ValueError:
+            # A corrupted field defeats the typed fast path - re-read and
+            # coerce bad values to NaN instead
+            df = pd.read_csv(filename, names=names, header=0 if has_header else None,
+                             engine='c', on_bad_lines='skip')
+            df = df.apply(pd.to_numeric, errors='coerce')
+
+        df.dropna(inplace=True)
+        # Sample and Time(ms) are integers in the Arduino output; the coerce
+        # fallback turns them into floats, so restore them here
+        df = df.astype({'Sample': 'int64', 'Time(ms)': 'int64'})
+
+        # Write the cleaned data back to file (plain CSV, even if the
+        # capture was compressed)
+        base = filename[:-3] if filename.endswith('.gz') else filename
+        clean_filename = f"{os.path.splitext(base)[0]}_clean.csv"
+        df.to_csv(clean_filename, index=False, float_format='%.4f')
+
         print(f"Cleaned data saved to {clean_filename}")
         return clean_filename
-        
+
     except Exception as e:
         print(f"Error cleaning data file: {e}")
         return filename
@@ -165,6 +177,12 @@ def main():
     try:
         # Configure serial port
         ser = serial.Serial(selected_port, 115200, timeout=2)
+        # Widen the driver-level RX FIFO where the backend supports it
+        # (Windows); gives the kernel more room while Python is busy
+        try:
+            ser.set_buffer_size(rx_size=131072)
+        except (AttributeError, NotImplementedError):
+            pass
         print(f"Connected to {selected_port}")
         time.sleep(2)  # Wait for Arduino to reset
         
@@ -178,12 +196,14 @@ def main():
         timeout = time.time() + 10  # 10 second timeout
         
         while not ready and time.time() < timeout:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line == "ARDUINO_DAQ_READY":
+            # Match the sentinel on raw bytes - only unexpected chatter
+            # pays for a decode (to be printable)
+            raw = ser.readline().strip()
+            if raw == b"ARDUINO_DAQ_READY":
                 ready = True
                 print("Arduino is ready!")
-            elif line:
-                print(f"Received: {line}")
+            elif raw:
+                print(f"Received: {raw.decode('utf-8', errors='ignore')}")
         
         if not ready:
             print("Arduino did not respond with ready signal, continuing anyway...")
@@ -194,54 +214,37 @@ def main():
             if choice.lower() != 'y':
                 break
             
-            # Create a filename for this recording session
-            filename = f"arduino_daq_data_{time.strftime('%Y%m%d_%H%M%S')}.csv"
-            
-            with open(filename, 'w', newline='') as file:
-                # Send start command
-                ser.write(b"START\n")
-                
-                print(f"Recording data to {filename}...")
-                recording = True
-                data_lines = 0
-                
-                # Start time for timeout
-                start_time = time.time()
-                timeout_duration = 15  # seconds
-                
-                while recording and (time.time() - start_time) < timeout_duration:
-                    if ser.in_waiting:
-                        line = ser.readline().decode('utf-8', errors='ignore').strip()
-                        
-                        if "RECORDING_COMPLETE" in line:
-                            recording = False
-                            print("Recording complete!")
-                        elif "SAMPLES_COLLECTED" in line:
-                            try:
-                                samples = int(line.split(":")[1])
-                                print(f"Collected {samples} samples")
-                            except:
-                                print(f"Received sample info: {line}")
-                        elif "END_OF_DATA" in line:
-                            print("End of data received")
-                        elif line:
-                            # Write the line to the file
-                            file.write(line + '\n')
-                            data_lines += 1
-                            
-                            # Show progress periodically
-                            if data_lines % 100 == 0:
-                                print(f"Received {data_lines} data points...", end='\r')
-                
-                print(f"\nSaved {data_lines} data points to {filename}")
-            
-            # Try to clean the data file
-            clean_filename = clean_data_file(filename)
+            # Create a filename for this recording session - level-1 gzip is
+            # near-memcpy speed and the numeric CSV compresses several-fold,
+            # so the write is lighter on disk bandwidth than the plain file
+            filename = f"arduino_daq_data_{time.strftime('%Y%m%d_%H%M%S')}.csv.gz"
             
+            # Drop whatever piled up while we were blocked in input() -
+            # the TTY buffer keeps filling during the prompt and an
+            # overrun there silently loses bytes
+            ser.reset_input_buffer()
+
+            # Send start command
+            ser.write(b"START\n")
+
+            print(f"Recording data to {filename}...")
+
+            # The shared hot loop validates lines as they arrive, so the
+            # file is written clean in one go and needs no clean pass
+            rows = capture(ser, timeout_duration=15)
+
+            df = pd.DataFrame(rows, columns=ROW_COLUMNS)
+            df['Sample'] = df['Sample'].astype(np.int64)
+            df['Time(ms)'] = df['Time(ms)'].astype(np.int64)
+            df.to_csv(filename, index=False,
+                      compression={'method': 'gzip', 'compresslevel': 1})
+
+            print(f"\nSaved {len(df)} data points to {filename}")
+
             # Ask if user wants to plot the data
             plot_choice = input("Plot the data? (y/n): ")
             if plot_choice.lower() == 'y':
-                plot_data(clean_filename)
+                plot_data(filename)
                 
     except serial.SerialException as e:
         print(f"Error: {e}")
@@ -13,10 +13,11 @@ def apply_lowpass_filter(data, fs):
     
     nyquist = 0.5 * fs
     normal_cutoff = cutoff_freq / nyquist
-    # analog=False implies  bilinear Transformation
-    b, a = signal.butter(filter_order, normal_cutoff, btype='low', analog=False)
-    filtered_data = signal.filtfilt(b, a, data)
-    
+    # design as second-order sections: numerically stable at higher orders and
+    # sosfiltfilt runs in the fast compiled kernel (bilinear transformation as before)
+    sos = signal.butter(filter_order, normal_cutoff, btype='low', output='sos')
+    filtered_data = signal.sosfiltfilt(sos, data)
+
     return filtered_data
 
 # Load data from CSV, apply a 4-pole low-pass filter, and save the filtered data